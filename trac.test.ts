@@ -18,6 +18,9 @@ const cases = [
     ["#(ps,(ABC))'", "ABC"],
     ["#(ps,ABC)'x", "ABC"],
     ["#(ps,] )#(ps,#(rs))'XYZ'", "] XYZ"],
+    ["#(ps,((a)(b)c))'", "(a)(b)c"],
+    ["#(ps,(((x))))'", "((x))"],
+    ["#(ps,a)(((b'#(ps,c)'", "a"], // unbalanced '(' clears the processor and stops
     //
     ["((3+4))*9 = #(ml,#(ad,3,4),9)'", "(3+4)*9 = 63"],
     // ss
@@ -29,6 +32,8 @@ const cases = [
     ["#(ps,(#(cl,bb)))'", "#(cl,bb)"],
     ["#(ps,##(cl,BB))'", ""],
     ["#(ps,#(cl,BB))'", ""],
+    ["#(ps,#(cl,toString))'", ""],
+    ["#(ds,__proto__,abc)'#(ps,#(cl,__proto__))'", "abc"],
     //
     ["##(qm)'", "'"],
     ["#(cm,`)'#(qm)`", "`"],
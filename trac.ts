@@ -1,28 +1,47 @@
-type Part = string | Marker; // a chunk of literal text or a numbered marker
-
 class Halt extends Error {}
 
+// this.args between calls; shared, since args are only ever read
+const NO_ARGS: readonly string[] = [];
+
+// char codes the scanner dispatches on
+const TAB = 0x09;
+const LF = 0x0a;
+const CR = 0x0d;
+const HASH = 0x23;
+const APOSTROPHE = 0x27;
+const LPAREN = 0x28;
+const RPAREN = 0x29;
+const COMMA = 0x2c;
+
 class Frame {
-    // index in neutral where the function body begins
+    // index of the neutral chunk where the function body begins
     begin: number;
     // "active" for "#(", "neutral" for "##("
     mode: "active" | "neutral";
-    argument_slices: Array<[number, number]>;
-    current_argument_start: number;
+    // neutral chunk indices between arguments, starting with begin; the closing
+    // ')' adds the end, after which argument k spans [boundaries[k], boundaries[k + 1])
+    boundaries: number[];
 
-    constructor(begin: number, mode: "active" | "neutral", current_argument_start: number) {
+    constructor(begin: number, mode: "active" | "neutral") {
         this.begin = begin;
         this.mode = mode;
-        this.argument_slices = [];
-        this.current_argument_start = current_argument_start;
+        this.boundaries = [begin];
     }
 }
 
-// A segment marker placed by ss(), numbered 1, 2, 3, ...
-class Marker {
-    n: number;
-    constructor(n: number) {
-        this.n = n;
+// A form body: literal text split at the segment markers placed by ss().
+// literals[k] is the text before markers[k] (marker numbers are 1, 2, 3, ...),
+// so there is always one more literal than markers; literals may be empty.
+class Form {
+    literals: string[];
+    markers: number[];
+    length: number; // number of literal characters (markers take no space)
+
+    constructor(literals: string[], markers: number[]) {
+        this.literals = literals;
+        this.markers = markers;
+        this.length = 0;
+        for (const literal of literals) this.length += literal.length;
     }
 }
 
@@ -41,20 +60,23 @@ export class TRAC {
         "ai", "ao", "sp", "rp",
     ]);
 
-    forms: Record<string, Part[]> = {};
+    static readonly INTEGER_CACHE_SIZE = 1024;
+
+    forms = new Map<string, Form>();
 
     // runtime working state (reset per record)
-    active: string[] = [];
-    neutral: string[] = [];
+    active: string = "";
+    neutral: string[] = []; // chunks of text; positions into it are chunk indices
     scan = 0;
 
     frames: Frame[] = [];
-    args: string[] = [];
+    args: readonly string[] = NO_ARGS; // arguments of the builtin being evaluated, after the name
 
     initial: string; // initial program to run: "#(ps,#(rs))" by default
 
     // interpreter I/O
-    input: string[] = []; // input stream for rs/rc
+    input: string = ""; // input stream for rs/rc, unread from inputPos on
+    inputPos = 0;
     output: (v: string) => void;
 
     interactive: boolean = false;
@@ -64,9 +86,13 @@ export class TRAC {
     tracing: boolean = false;
     newline: boolean = true; // whether the last output ended with a newline
 
-    private _skip_chars = new Set<string>(["\t", "\n", "\r", "'"]);
+    // a run of characters with no meaning to the scanner (sticky, matched at scan);
+    // anything else is one of the char codes dispatched in _scan()
+    private _ordinary = /[^#(,)\t\n\r']+/y;
 
-    formPointers: Record<string, number> = {}; // per-form pointers (character index, ignoring markers)
+    formPointers = new Map<string, number>(); // per-form pointers (character index, ignoring markers)
+    // parsed numeric arguments, by their text (see _bigintArg)
+    private _integers = new Map<string, bigint>();
     private _forceActiveInsert: string | null = null; // request to force-active deliver a value from a builtin
     private _inputWaiter: ((ch: string | undefined) => void) | null = null;
 
@@ -76,7 +102,7 @@ export class TRAC {
         { initial, interactive }: { initial?: string; interactive: boolean } = { interactive: false }
     ) {
         this.initial = initial ?? "#(ps,#(rs))";
-        this.input = Array.isArray(input) ? input : Array.from(input);
+        this.input = Array.isArray(input) ? input.join("") : input;
         this.output = output;
         this.interactive = interactive;
         this.tracing = false;
@@ -85,6 +111,20 @@ export class TRAC {
     async run() {
         this._reset_processor(this.initial);
 
+        // hl (and rc out of input) stop the run by throwing Halt out of a builtin
+        try {
+            while (this._scan()) await this._end_function_and_evaluate();
+        } catch (e) {
+            if (!(e instanceof Halt)) throw e;
+        }
+
+        return this.neutral.join("");
+    }
+
+    // Runs the scanner up to the next ')' that ends a function (consumed) and
+    // returns true; that is the only step that may have to await, for a builtin.
+    // Returns false if unbalanced parentheses cleared the processor.
+    private _scan(): boolean {
         while (true) {
             // Step 2: end-of-active?
             if (this.scan >= this.active.length) {
@@ -92,128 +132,119 @@ export class TRAC {
                 this._reset_processor(this.initial);
             }
 
-            const ch = this.active[this.scan];
-
-            // Step 3: control chars / apostrophe = record end
-            if (this._skip_chars.has(ch)) {
-                this.scan++;
+            // Step 10: ordinary chars, moved to neutral as one chunk per run
+            this._ordinary.lastIndex = this.scan;
+            if (this._ordinary.test(this.active)) {
+                this.neutral.push(this.active.slice(this.scan, this._ordinary.lastIndex));
+                this.scan = this._ordinary.lastIndex;
                 continue;
             }
 
-            // Step 4: protective parentheses
-            if (ch === "(") {
-                if (!this._consume_balanced_parentheses_into_neutral()) {
-                    this._clear_processor();
+            switch (this.active.charCodeAt(this.scan)) {
+                // Step 3: control chars / apostrophe = record end
+                case TAB:
+                case LF:
+                case CR:
+                case APOSTROPHE:
+                    this.scan++;
                     break;
-                }
-                continue;
-            }
 
-            // Step 5: comma -> argument boundary
-            if (ch === ",") {
-                this.scan++;
-                this._mark_argument_boundary();
-                continue;
-            }
+                // Step 4: protective parentheses
+                case LPAREN:
+                    if (!this._consume_balanced_parentheses_into_neutral()) {
+                        this._clear_processor();
+                        return false;
+                    }
+                    break;
 
-            // Step 6/7: #( or ##(
-            if (ch === "#") {
-                if (this._peek("(")) {
-                    // "#("
-                    this.scan += 2;
-                    this._begin_function("active");
-                    continue;
-                }
-                if (this._peek("#", "(")) {
-                    // "##("
-                    this.scan += 3;
-                    this._begin_function("neutral");
-                    continue;
-                }
-                // Step 8: a lone '#'
-                this.neutral.push(ch);
-                this.scan++;
-                continue;
-            }
+                // Step 5: comma -> argument boundary
+                case COMMA:
+                    this.scan++;
+                    this._mark_argument_boundary();
+                    break;
 
-            // Step 9: end of function
-            if (ch === ")") {
-                this.scan++;
-                try {
-                    await this._end_function_and_evaluate();
-                } catch (e) {
-                    if (e instanceof Halt) break;
-                    throw e;
-                }
-                continue;
-            }
+                // Step 6/7: #( or ##(
+                case HASH:
+                    if (this._peek("(")) {
+                        // "#("
+                        this.scan += 2;
+                        this._begin_function("active");
+                    } else if (this._peek("#(")) {
+                        // "##("
+                        this.scan += 3;
+                        this._begin_function("neutral");
+                    } else {
+                        // Step 8: a lone '#'
+                        this.neutral.push("#");
+                        this.scan++;
+                    }
+                    break;
 
-            // Step 10: ordinary char
-            this.neutral.push(ch);
-            this.scan++;
+                // Step 9: end of function, evaluated by run()
+                case RPAREN:
+                    this.scan++;
+                    return true;
+            }
         }
-
-        return this.neutral.join("");
     }
 
     private _clear_processor() {
+        // neutral and frames are emptied in place, never replaced with new arrays
         this.neutral.length = 0;
-        this.active.length = 0;
+        this.active = "";
         this.scan = 0;
         this.frames.length = 0;
-        this.args = [];
+        this.args = NO_ARGS;
     }
 
     private _reset_processor(program: string) {
         this._clear_processor();
-        this.active = Array.from(program);
+        this.active = program;
     }
 
-    private _peek(...expect: string[]): boolean {
-        let i = this.scan + 1;
-        if (i + expect.length - 1 >= this.active.length) return false;
-        for (let offset = 0; offset < expect.length; offset += 1) {
-            if (this.active[i + offset] !== expect[offset]) return false;
-        }
-        return true;
+    private _peek(expect: string): boolean {
+        return this.active.startsWith(expect, this.scan + 1);
     }
 
     private _consume_balanced_parentheses_into_neutral(): boolean {
-        this.scan++; // consume '('
+        const start = this.scan + 1; // skip '('
         let depth = 1;
-        while (this.scan < this.active.length) {
-            const ch = this.active[this.scan];
-            if (ch === "(") {
+        let i = start;
+        let open = this.active.indexOf("(", i);
+        while (true) {
+            const close = this.active.indexOf(")", i);
+            if (close === -1) return false;
+            if (open !== -1 && open < close) {
                 depth++;
-                this.neutral.push(ch);
-            } else if (ch === ")") {
-                depth--;
-                if (depth === 0) {
-                    this.scan++; // consume matching ')'
-                    return true;
-                }
-                this.neutral.push(ch);
-            } else {
-                this.neutral.push(ch);
+                i = open + 1;
+                open = this.active.indexOf("(", i);
+                continue;
+            }
+            depth--;
+            i = close + 1;
+            if (depth === 0) {
+                // everything between the outer parens goes to neutral verbatim
+                this.neutral.push(this.active.slice(start, close));
+                this.scan = i; // consume matching ')'
+                return true;
             }
-            this.scan++;
         }
-        return false;
     }
 
     private _begin_function(mode: "active" | "neutral") {
-        const begin = this.neutral.length;
-        const frame = new Frame(begin, mode, begin);
-        this.frames.push(frame);
+        this.frames.push(new Frame(this.neutral.length, mode));
     }
 
     private _mark_argument_boundary() {
         if (!this.frames.length) return;
-        const frame = this.frames[this.frames.length - 1];
-        const current_end = this.neutral.length;
-        const current_slice: [number, number] = [frame.current_argument_start, current_end];
-        frame.argument_slices.push(current_slice);
-        frame.current_argument_start = this.neutral.length;
+        this.frames[this.frames.length - 1].boundaries.push(this.neutral.length);
+    }
+
+    private _neutral_text(a: number, b: number): string {
+        // arguments are mostly empty or a single chunk; skip slice + join for those
+        if (b - a === 1) return this.neutral[a];
+        if (b === a) return "";
+        return this.neutral.slice(a, b).join("");
     }
 
     private async _end_function_and_evaluate() {
@@ -223,20 +254,21 @@ export class TRAC {
         }
 
         const frame = this.frames.pop() as Frame;
-        const final_end = this.neutral.length;
-        frame.argument_slices.push([frame.current_argument_start, final_end]);
-
-        // extract string arguments from neutral
-        const body_start = frame.begin;
-        const body_end = final_end;
-        const args: string[] = frame.argument_slices.map(([a, b]) => this.neutral.slice(a, b).join(""));
+        const boundaries = frame.boundaries;
+        boundaries.push(this.neutral.length);
+
+        // extract the name and string arguments from neutral
+        const name = this._neutral_text(boundaries[0], boundaries[1]);
+        const args: string[] = new Array(boundaries.length - 2);
+        for (let k = 0; k < args.length; k++) {
+            args[k] = this._neutral_text(boundaries[k + 1], boundaries[k + 2]);
+        }
 
-        // remove the function body from neutral
-        this.neutral.splice(body_start, body_end - body_start);
+        // remove the function body from neutral; it is always the tail, so truncate
+        this.neutral.length = frame.begin;
 
         // evaluate
-        const name = args.length ? args[0] : "";
-        this.args = args.slice(1);
+        this.args = args;
         let value = "";
 
         if (this.tracing) {
@@ -256,24 +288,9 @@ export class TRAC {
         }
 
         // 1. if a form with this name exists, treat it as #(cl,name, A1, A2, ...)
-        if (Object.prototype.hasOwnProperty.call(this.forms, name)) {
-            const parts = this.forms[name];
-
-            // build replacement map: 1 -> A1, 2 -> A2, ...
-            const replacement = new Map<number, string>();
-            for (let i = 0; i < this.args.length; i++) {
-                replacement.set(i + 1, this.args[i] ?? "");
-            }
-
-            const chunks: string[] = [];
-            for (const part of parts) {
-                if (part instanceof Marker) {
-                    chunks.push(replacement.get(part.n) ?? "");
-                } else {
-                    chunks.push(part);
-                }
-            }
-            value = chunks.join("");
+        const form = this.forms.get(name);
+        if (form !== undefined) {
+            value = this._fillForm(form, 0);
         } else if (TRAC.BUILTINS.has(name)) {
             // 2. else fall back to a builtin of that name (if any)
             value = await (this as any)[name]();
@@ -286,53 +303,52 @@ export class TRAC {
             const v = this._forceActiveInsert;
             this._forceActiveInsert = null;
             // deliver as ACTIVE regardless of frame.mode
-            this.active = Array.from(v).concat(this.active.slice(this.scan));
-            this.scan = 0;
-            this.args = [];
+            this._deliver_active(v);
+            this.args = NO_ARGS;
             return; // skip the normal delivery below
         }
 
         if (frame.mode === "neutral") {
-            this.neutral.push(...Array.from(value));
+            if (value !== "") this.neutral.push(value);
         } else {
-            this.active = Array.from(value).concat(this.active.slice(this.scan));
-            this.scan = 0;
+            this._deliver_active(value);
         }
 
-        this.args = [];
+        this.args = NO_ARGS;
+    }
+
+    private _deliver_active(value: string) {
+        // null values (ds, ss, ps, ...) leave the unread tail where it is
+        if (value === "") return;
+        this.active = value + this.active.slice(this.scan);
+        this.scan = 0;
     }
 
-    private _ensurePointer(name: string) {
-        if (!(name in this.formPointers)) this.formPointers[name] = 0;
+    private _pointer(name: string): number {
+        return this.formPointers.get(name) ?? 0;
     }
 
     private _formLength(name: string): number {
-        if (!(name in this.forms)) return 0;
-        let v = 0;
-        for (const part of this.forms[name]) {
-            if (typeof part === "string") v += part.length;
-        }
-        return v;
+        return this.forms.get(name)?.length ?? 0;
     }
 
     private _formSlice(name: string, start: number, end: number): string {
-        // Slice [start, end) by counting only literal characters, skipping Markers
-        if (!(name in this.forms)) return "";
+        // Slice [start, end) by counting only literal characters, skipping markers
+        const form = this.forms.get(name);
+        if (form === undefined) return "";
 
         if (start < 0) start = 0;
-        const formLength = this._formLength(name);
-        if (end > formLength) end = formLength;
+        if (end > form.length) end = form.length;
         if (start >= end) return "";
 
         let v = "";
         let i = 0; // character index among literal chars
-        for (const part of this.forms[name]) {
-            if (part instanceof Marker) continue;
-            const advance = i + part.length;
+        for (const literal of form.literals) {
+            const advance = i + literal.length;
             // overlap of [i, advance) with [start, end)
             const a = Math.max(start, i);
             const b = Math.min(end, advance);
-            if (b > a) v += part.slice(a - i, b - i);
+            if (b > a) v += literal.slice(a - i, b - i);
             i = advance;
             if (i >= end) break;
         }
@@ -340,71 +356,61 @@ export class TRAC {
     }
 
     private _markerBoundaries(name: string): number[] {
-        // Return the list of character positions (ignoring markers) where a Marker sits,
+        // Return the list of character positions (ignoring markers) where a marker sits,
         // i.e., boundary immediately to the *right* of the characters encountered so far.
         // Also append the end-of-body as a boundary.
         const bounds: number[] = [];
-        if (!(name in this.forms)) return [0];
+        const form = this.forms.get(name);
+        if (form === undefined) return [0];
 
         let i = 0;
-        for (const part of this.forms[name]) {
-            if (part instanceof Marker) {
-                bounds.push(i);
-            } else {
-                i += part.length;
-            }
+        for (let k = 0; k < form.markers.length; k++) {
+            i += form.literals[k].length;
+            bounds.push(i);
         }
-        bounds.push(i); // end of body counts as a boundary
+        bounds.push(form.length); // end of body counts as a boundary
         return bounds;
     }
 
+    private _fillForm(form: Form, first: number): string {
+        // marker n takes the n-th argument counting from this.args[first]
+        const { literals, markers } = form;
+        let v = literals[0];
+        for (let k = 0; k < markers.length; k++) {
+            v += this._arg(first + markers[k] - 1) + literals[k + 1];
+        }
+        return v;
+    }
+
     private async ds() {
         const name = this._arg(0);
         const body = this._arg(1);
         if (!name) return "";
-        this.forms[name] = [body]; // literal body, no markers yet
-        this.formPointers[name] = 0; // reset pointer when (re)defining a form
+        this.forms.set(name, new Form([body], [])); // literal body, no markers yet
+        this.formPointers.set(name, 0); // reset pointer when (re)defining a form
         return "";
     }
 
     private async ss() {
         const name = this._arg(0);
-        if (!(name in this.forms)) return "";
-        let parts = this.forms[name];
-
-        const replace_pattern_in_parts = (partsIn: Part[], pattern: string, index: number): Part[] => {
-            if (pattern === "") return partsIn;
-
-            const rebuilt: Part[] = [];
-            for (const part of partsIn) {
-                if (part instanceof Marker) {
-                    rebuilt.push(part);
-                    continue;
-                }
-                let i = 0;
-                const advance = pattern.length;
-                while (true) {
-                    const j = part.indexOf(pattern, i);
-                    if (j === -1) {
-                        rebuilt.push(part.slice(i));
-                        break;
-                    }
-                    rebuilt.push(part.slice(i, j)); // prefix
-                    rebuilt.push(new Marker(index)); // marker
-                    i = j + advance; // continue after match
+        if (!this.forms.has(name)) return "";
+        let form = this.forms.get(name) as Form;
+
+        const replace_pattern_in_form = (formIn: Form, pattern: string, index: number): Form => {
+            if (pattern === "") return formIn;
+
+            const literals: string[] = [];
+            const markers: number[] = [];
+            formIn.literals.forEach((literal, k) => {
+                const segments = literal.split(pattern);
+                literals.push(segments[0]);
+                for (let j = 1; j < segments.length; j++) {
+                    markers.push(index); // marker in place of each match
+                    literals.push(segments[j]);
                 }
-            }
-
-            // merge adjacent strings for cleanliness
-            const merged: Part[] = [];
-            for (const part of rebuilt) {
-                if (merged.length && typeof merged[merged.length - 1] === "string" && typeof part === "string") {
-                    merged[merged.length - 1] = merged[merged.length - 1] + part;
-                } else {
-                    merged.push(part);
-                }
-            }
-            return merged;
+                if (k < formIn.markers.length) markers.push(formIn.markers[k]);
+            });
+            return new Form(literals, markers);
         };
 
         // NOTE: this.args currently contains only parameters after the function name,
@@ -412,46 +418,28 @@ export class TRAC {
         // Markers are numbered by the ordinal position of Pi (1-based).
         this.args.slice(1).forEach((pattern, idx) => {
             if (pattern !== "") {
-                parts = replace_pattern_in_parts(parts, pattern, idx + 1);
+                form = replace_pattern_in_form(form, pattern, idx + 1);
             }
         });
 
-        this.forms[name] = parts;
+        this.forms.set(name, form);
         return "";
     }
 
     private async cl() {
         const name = this._arg(0);
-        if (!(name in this.forms)) return "";
-        const parts = this.forms[name];
-
-        // build replacement map 1->A1, 2->A2, ...
-        const replacement = new Map<number, string>();
-        for (let i = 0; i < this.args.length; i++) {
-            // this.args[0] is N
-            const ai = this.args[i + 1] ?? "";
-            replacement.set(i + 1, ai);
-        }
-
-        const chunks: string[] = [];
-        for (const part of parts) {
-            if (part instanceof Marker) {
-                chunks.push(replacement.get(part.n) ?? "");
-            } else {
-                chunks.push(part);
-            }
-        }
-        return chunks.join("");
+        const form = this.forms.get(name);
+        if (form === undefined) return "";
+        return this._fillForm(form, 1); // this.args[0] is N
     }
 
     private async cs() {
         const name = this._arg(0);
         const Z = this._arg(1);
-        if (!(name in this.forms)) return "";
+        if (!this.forms.has(name)) return "";
 
-        this._ensurePointer(name);
         const formLength = this._formLength(name);
-        let pointer = this.formPointers[name];
+        let pointer = this._pointer(name);
 
         if (pointer >= formLength) {
             // return Z in ACTIVE mode regardless of call mode
@@ -470,18 +458,17 @@ export class TRAC {
         }
 
         const v = this._formSlice(name, pointer, end);
-        this.formPointers[name] = end; // pointer left just before the char right of marker
+        this.formPointers.set(name, end); // pointer left just before the char right of marker
         return v;
     }
 
     private async cc() {
         const name = this._arg(0);
         const Z = this._arg(1);
-        if (!(name in this.forms)) return "";
+        if (!this.forms.has(name)) return "";
 
-        this._ensurePointer(name);
         const formLength = this._formLength(name);
-        let pointer = this.formPointers[name];
+        let pointer = this._pointer(name);
 
         if (pointer >= formLength) {
             this._forceActiveInsert = Z; // active-mode return
@@ -489,7 +476,7 @@ export class TRAC {
         }
 
         const v = this._formSlice(name, pointer, pointer + 1);
-        this.formPointers[name] = pointer + 1; // advance just beyond selected character
+        this.formPointers.set(name, pointer + 1); // advance just beyond selected character
         return v;
     }
 
@@ -497,12 +484,11 @@ export class TRAC {
         const name = this._arg(0);
         const D_ = this._bigintArg(1);
         const Z = this._arg(2);
-        if (!(name in this.forms)) return "";
+        if (!this.forms.has(name)) return "";
 
         const D = Number(D_); // D can be negative; we only use small ranges in practice
-        this._ensurePointer(name);
         const formLength = this._formLength(name);
-        let pointer = this.formPointers[name];
+        let pointer = this._pointer(name);
 
         if (D === 0) return ""; // null string, pointer does not move
 
@@ -513,7 +499,7 @@ export class TRAC {
                 return "";
             }
             const v = this._formSlice(name, pointer, end);
-            this.formPointers[name] = end;
+            this.formPointers.set(name, end);
             return v;
         } else {
             // D < 0, read to the left, return in normal order, move pointer left
@@ -523,7 +509,7 @@ export class TRAC {
                 return "";
             }
             const v = this._formSlice(name, start, pointer);
-            this.formPointers[name] = start;
+            this.formPointers.set(name, start);
             return v;
         }
     }
@@ -533,11 +519,10 @@ export class TRAC {
         const X = this._arg(1);
         const Z = this._arg(2);
 
-        if (!(name in this.forms)) return "";
+        if (!this.forms.has(name)) return "";
 
-        this._ensurePointer(name);
         const formLength = this._formLength(name);
-        const pointer = this.formPointers[name];
+        const pointer = this._pointer(name);
 
         const lenX = X.length;
         // Empty X matches immediately at pointer (returns empty, pointer unchanged).
@@ -575,7 +560,7 @@ export class TRAC {
         const value = this._formSlice(name, pointer, foundAt);
 
         // Move pointer to just before the char immediately following the matching substring
-        this.formPointers[name] = foundAt + lenX;
+        this.formPointers.set(name, foundAt + lenX);
 
         return value;
     }
@@ -583,42 +568,39 @@ export class TRAC {
     private async eq() {
         const A = this._arg(0);
         const B = this._arg(1);
-        const T = this._arg(2);
-        const F = this._arg(3);
-        return A === B ? T : F;
+        // === on strings already fails fast on a length mismatch
+        return A === B ? this._arg(2) : this._arg(3); // T : F
     }
 
     private async gr() {
         const A = this._bigintArg(0);
         const B = this._bigintArg(1);
-        const T = this._arg(2);
-        const F = this._arg(3);
-        return A > B ? T : F;
+        return A > B ? this._arg(2) : this._arg(3); // T : F
     }
 
     private async ml() {
         const a = this._bigintArg(0);
         const b = this._bigintArg(1);
-        return (a * b).toString();
+        return this._bigintResult(a * b);
     }
 
     private async dv() {
         const a = this._bigintArg(0);
         const b = this._bigintArg(1);
         if (b === 0n) return "0";
-        return (a / b).toString();
+        return this._bigintResult(a / b);
     }
 
     private async ad() {
         const a = this._bigintArg(0);
         const b = this._bigintArg(1);
-        return (a + b).toString();
+        return this._bigintResult(a + b);
     }
 
     private async su() {
         const a = this._bigintArg(0);
         const b = this._bigintArg(1);
-        return (a - b).toString();
+        return this._bigintResult(a - b);
     }
 
     private _boolSuffix(s: string): string {
@@ -708,21 +690,20 @@ export class TRAC {
 
     private async ln() {
         const separator = this._arg(0);
-        const names = Object.keys(this.forms);
-        return names.join(separator);
+        return Array.from(this.forms.keys()).join(separator);
     }
 
     private async da() {
-        this.forms = {};
-        this.formPointers = {};
+        this.forms.clear();
+        this.formPointers.clear();
         return "";
     }
 
     private async dd() {
         for (let i = 0; i < this.args.length; i++) {
             const name = this._arg(i);
-            if (name in this.forms) delete this.forms[name];
-            if (name in this.formPointers) delete this.formPointers[name];
+            this.forms.delete(name);
+            this.formPointers.delete(name);
         }
         return "";
     }
@@ -744,13 +725,27 @@ export class TRAC {
                 this._inputWaiter = null;
                 resolve(ch);
             } else {
-                this.input.push(ch);
+                this.input += ch;
             }
         }
     }
 
+    private _consumeInput(end: number) {
+        this.inputPos = end;
+        // drop what has been read once the buffer is drained
+        if (this.inputPos >= this.input.length) {
+            this.input = "";
+            this.inputPos = 0;
+        }
+    }
+
     private async rc() {
-        if (this.input.length > 0) return this.input.shift();
+        if (this.inputPos < this.input.length) {
+            // one code point, as Array.from() splits strings
+            const ch = String.fromCodePoint(this.input.codePointAt(this.inputPos) as number);
+            this._consumeInput(this.inputPos + ch.length);
+            return ch;
+        }
         if (!this.interactive) throw new Halt();
         return await new Promise<string | undefined>((resolve) => {
             this._inputWaiter = resolve;
@@ -758,6 +753,14 @@ export class TRAC {
     }
 
     private async rs() {
+        // whole record already buffered: take it in one slice
+        const end = this.input.indexOf(this.meta, this.inputPos);
+        if (end !== -1) {
+            const result = this.input.slice(this.inputPos, end);
+            this._consumeInput(end + this.meta.length);
+            return result;
+        }
+
         let result = "";
 
         while (true) {
@@ -780,10 +783,10 @@ export class TRAC {
         // pointer is shown as "<↑>".
         // segment markers are shown as "<i>" (i = ordinal)
         const name = this._arg(0);
-        if (!(name in this.forms)) return "";
+        const form = this.forms.get(name);
+        if (form === undefined) return "";
 
-        this._ensurePointer(name);
-        const pointer = this.formPointers[name];
+        const pointer = this._pointer(name);
         const MARK = "<↑>";
 
         let v = "";
@@ -797,14 +800,12 @@ export class TRAC {
             }
         };
 
-        for (const part of this.forms[name]) {
-            if (part instanceof Marker) {
+        form.literals.forEach((s, n) => {
+            if (n > 0) {
+                // the marker between literals n - 1 and n
                 maybePrintPointerAt(i);
-                v += `<${part.n}>`;
-                continue;
+                v += `<${form.markers[n - 1]}>`;
             }
-            // literal string
-            const s = part as string;
             const L = s.length;
 
             // If pointer falls inside this literal chunk, split once.
@@ -816,7 +817,7 @@ export class TRAC {
                 v += s;
             }
             i += L;
-        }
+        });
 
         // Pointer at end of form
         maybePrintPointerAt(i);
@@ -874,17 +875,14 @@ export class TRAC {
 
     private async sr() {
         const name = this._arg(0);
-        if (!(name in this.forms)) return "0";
+        const form = this.forms.get(name);
+        if (form === undefined) return "0";
 
-        const parts = this.forms[name];
-        const seen = new Set<number>();
+        const seen = new Set<number>(form.markers);
         let max = 0;
 
-        for (const part of parts) {
-            if (part instanceof Marker) {
-                seen.add(part.n);
-                if (part.n > max) max = part.n;
-            }
+        for (const n of form.markers) {
+            if (n > max) max = n;
         }
 
         if (max === 0) return "0"; // no markers -> no gaps
@@ -902,9 +900,8 @@ export class TRAC {
 
         if (this.args.length === 1) {
             const name = this._arg(0);
-            if (name in this.forms) {
-                this._ensurePointer(name);
-                this.formPointers[name] = 0; // reset to just before the first character
+            if (this.forms.has(name)) {
+                this.formPointers.set(name, 0); // reset to just before the first character
             }
             return "";
         }
@@ -963,7 +960,30 @@ export class TRAC {
     }
 
     private _bigintArg(i: number): bigint {
-        const s = this._arg(i) || "0";
+        const s = this._arg(i);
+        let v = this._integers.get(s);
+        if (v === undefined) {
+            v = this._parseBigint(s);
+            this._cacheInteger(s, v);
+        }
+        return v;
+    }
+
+    private _bigintResult(v: bigint): string {
+        // an arithmetic result usually comes straight back as an argument
+        // (e.g. the running product in factorial), so it is cached as parsed
+        const s = v.toString();
+        this._cacheInteger(s, v);
+        return s;
+    }
+
+    private _cacheInteger(s: string, v: bigint) {
+        // bounded: start over rather than grow with every distinct intermediate result
+        if (this._integers.size >= TRAC.INTEGER_CACHE_SIZE) this._integers.clear();
+        this._integers.set(s, v);
+    }
+
+    private _parseBigint(s: string): bigint {
         // Support optional leading '+' and decimal representation.
         // BigInt doesn't like plus signs, so normalize.
         const norm = s.trim().replace(/^\+/, "") || "0";